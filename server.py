@@ -1,38 +1,82 @@
 from fastapi import FastAPI, Request, UploadFile, File, Form
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 import os
+import sys
+import asyncio
 import openai
-import requests
+import orjson
+import httpx
+from contextlib import AsyncExitStack, asynccontextmanager
 from datetime import datetime, timedelta
 import json
-from typing import Optional
+import re
+import atexit
+import logging
+import logging.handlers
+import queue
+import time
+import uuid
+from typing import Dict, Optional
 from pydantic import BaseModel
 from dotenv import load_dotenv
-import tempfile
-import base64
 from bs4 import BeautifulSoup
 
 # Load environment variables
 load_dotenv()
 
+# Logging goes through a queue so handler I/O happens on a background thread.
+# Only the "server" logger is configured: raising the root logger to INFO would
+# also enable httpx's request logging, which prints SerpAPI URLs with the API key.
+log_stream_handler = logging.StreamHandler()
+log_stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(log_queue, log_stream_handler)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+log = logging.getLogger("server")
+log.setLevel(logging.INFO)
+log.addHandler(logging.handlers.QueueHandler(log_queue))
+log.propagate = False
+
 # Debug logging for environment variables
-print("Checking environment variables...")
+log.info("Checking environment variables...")
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 SERPAPI_KEY = os.getenv('SERPAPI_KEY')
 
-print(f"OPENAI_API_KEY exists: {bool(OPENAI_API_KEY)}")
-print(f"SERPAPI_KEY exists: {bool(SERPAPI_KEY)}")
+log.info("OPENAI_API_KEY exists: %s", bool(OPENAI_API_KEY))
+log.info("SERPAPI_KEY exists: %s", bool(SERPAPI_KEY))
 
 if not OPENAI_API_KEY:
     raise ValueError("OPENAI_API_KEY not found in environment variables")
 
-openai.api_key = OPENAI_API_KEY
+# Shared OpenAI client, reused across requests to keep its connection pool warm
+openai_client = openai.AsyncOpenAI(
+    api_key=OPENAI_API_KEY,
+    timeout=httpx.Timeout(60.0, connect=3.0)  # Whisper/TTS can be slow, but not unbounded
+)
+
+# Search answers waiting to be spoken, keyed by audio_id. This lives in process
+# memory, so the app must run as a single worker (see README). Each entry holds the
+# text, its expiry time, the generated MP3 once complete, and an event that is
+# set once generation has been attempted, so TTS runs at most once per answer.
+SPEECH_TTL_SECONDS = 300
+SPEECH_CACHE_SIZE = 128  # Each entry may hold a full MP3
+SPEECH_WAIT_SECONDS = 60
+pending_speech: Dict[str, dict] = {}
 
-# Create a temporary directory for audio files
-TEMP_DIR = tempfile.gettempdir()
+# Cricket answers keyed by the 'yesterday' date they describe
+CRICKET_CACHE_SIZE = 8
+cricket_cache: Dict[str, str] = {}
+
+# Parsed sena.services answer, revalidated with its ETag after the TTL
+SENA_CACHE_TTL_SECONDS = 300
+# last_failed records whether the most recent fetch failed, to decide when
+# the cricket fallback is worth starting speculatively
+sena_cache = {"text": None, "etag": None, "expires_at": 0.0, "last_failed": False}
 
 # Pydantic models for request validation
 class OfferRequest(BaseModel):
@@ -44,9 +88,51 @@ class IceCandidateRequest(BaseModel):
 class SearchRequest(BaseModel):
     query: str
 
-app = FastAPI()
+# Keywords that route a search query to the cricket results lookup
+CRICKET_RE = re.compile(r'cricket|sports|match|game|wicket|yesterday', re.IGNORECASE)
+
+# Hard ceiling on each outbound lookup, on top of the HTTP client timeouts
+EXTERNAL_CALL_TIMEOUT = 15
+
+# Base SerpAPI parameters; each search adds its own 'q'
+SERPAPI_PARAMS = {
+    'api_key': SERPAPI_KEY,
+    'engine': 'google',
+    'num': 5  # Get more results for better accuracy
+}
+
+SENA_SERVICES_FOOTER = "\n\nFor more detailed information, please visit https://sena.services directly."
 
-# Add GZip compression
+# Pre-rendered response used when no services can be scraped from sena.services
+DEFAULT_SERVICES = [
+    "Web Development",
+    "Mobile App Development",
+    "Cloud Services",
+    "AI and Machine Learning",
+    "Digital Marketing",
+    "IT Consulting"
+]
+DEFAULT_SERVICES_TEXT = (
+    "Sena provides the following services:\n"
+    + "\n".join(f"- {service}" for service in DEFAULT_SERVICES)
+    + SENA_SERVICES_FOOTER
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared HTTP client so outbound calls reuse one connection pool
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        timeout=httpx.Timeout(10.0, connect=3.0),
+        follow_redirects=True,
+        limits=httpx.Limits(max_keepalive_connections=50)
+    )
+    yield
+    await app.state.http.aclose()
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+# Add GZip compression for text responses (audio opts out via Content-Encoding)
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 # CORS middleware configuration
@@ -59,17 +145,6 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
-# Mount static files
-app.mount("/static", StaticFiles(directory="."), name="static")
-
-@app.get("/")
-async def read_root():
-    return FileResponse('index.html')
-
-@app.get("/app.js")
-async def read_js():
-    return FileResponse('app.js')
-
 @app.post("/api/offer")
 async def handle_offer(request: OfferRequest):
     try:
@@ -79,9 +154,9 @@ async def handle_offer(request: OfferRequest):
             'type': 'answer',
             'sdp': 'mock-sdp'
         }
-        return JSONResponse(content=answer)
+        return ORJSONResponse(content=answer)
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -90,9 +165,9 @@ async def handle_offer(request: OfferRequest):
 async def handle_ice_candidate(request: IceCandidateRequest):
     try:
         # Here you would typically forward the ICE candidate to OpenAI's WebRTC endpoint
-        return JSONResponse(content={"status": "success"})
+        return ORJSONResponse(content={"status": "success"})
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -100,230 +175,348 @@ async def handle_ice_candidate(request: IceCandidateRequest):
 @app.post("/api/transcribe")
 async def transcribe_audio(file: UploadFile = File(...)):
     try:
-        print("Received audio file for transcription")
-        
-        # Create a unique temporary file path
-        temp_path = os.path.join(TEMP_DIR, f"temp_audio_{datetime.now().strftime('%Y%m%d_%H%M%S')}.wav")
+        log.info("Received audio file for transcription")
         
         try:
-            # Save the file to the temporary directory
-            with open(temp_path, 'wb') as f:
-                content = await file.read()
-                if not content:
-                    raise ValueError("Empty file received")
-                f.write(content)
-            print(f"Audio file saved successfully to {temp_path}")
-            
-            # Check file size
-            file_size = os.path.getsize(temp_path)
+            # Read the upload into memory; passing the spooled file object on to
+            # the OpenAI SDK would make httpx call fileno() and roll it to disk
+            content = await file.read()
+            file_size = len(content)
             if file_size == 0:
-                raise ValueError("File is empty")
-            print(f"File size: {file_size} bytes")
+                raise ValueError("Empty file received")
+            log.debug("File size: %d bytes", file_size)
             
         except Exception as e:
-            print(f"Error saving file: {str(e)}")
-            return JSONResponse(
+            log.error("Error reading file: %s", e)
+            return ORJSONResponse(
                 status_code=500,
-                content={"error": f"Error saving file: {str(e)}"}
+                content={"error": f"Error reading file: {str(e)}"}
             )
         
         try:
             # Transcribe using OpenAI's Whisper API with the new format
-            print("Starting transcription with OpenAI")
-            client = openai.OpenAI(api_key=OPENAI_API_KEY)
-            
-            with open(temp_path, 'rb') as f:
-                transcript = client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=f
-                )
-            print("Transcription completed successfully")
+            log.debug("Starting transcription with OpenAI")
+            transcript = await openai_client.audio.transcriptions.create(
+                model="whisper-1",
+                file=(file.filename or "audio.wav", content, file.content_type or "audio/wav")
+            )
+            log.info("Transcription completed successfully")
             
         except Exception as e:
-            print(f"Error during transcription: {str(e)}")
-            return JSONResponse(
+            log.error("Error during transcription: %s", e)
+            return ORJSONResponse(
                 status_code=500,
                 content={"error": f"Error during transcription: {str(e)}"}
             )
-        finally:
-            # Clean up
-            try:
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
-                    print("Temporary file removed")
-            except Exception as e:
-                print(f"Error removing temporary file: {str(e)}")
         
-        return JSONResponse(content={"text": transcript.text})
+        return ORJSONResponse(content={"text": transcript.text})
         
     except Exception as e:
-        print(f"Unexpected error: {str(e)}")
-        return JSONResponse(
+        log.exception("Unexpected error: %s", e)
+        return ORJSONResponse(
             status_code=500,
             content={"error": f"Unexpected error: {str(e)}"}
         )
 
+async def fetch_cricket_results(http: httpx.AsyncClient, yesterday: str) -> Optional[str]:
+    """Search SerpAPI for cricket results from `yesterday`.
+
+    Returns the formatted response text, or None if no usable results were found.
+    Successful answers are cached per date, since they don't change within the day.
+    """
+    if yesterday in cricket_cache:
+        return cricket_cache[yesterday]
+    
+    search_query = f"cricket match results {yesterday} scorecard highlights"
+    params = {**SERPAPI_PARAMS, 'q': search_query}
+    response = await asyncio.wait_for(
+        http.get('https://serpapi.com/search', params=params),
+        timeout=EXTERNAL_CALL_TIMEOUT
+    )
+    results = orjson.loads(response.content)
+    
+    # Combine information from the top 3 results for better coverage
+    cricket_info = [
+        result['snippet']
+        for result in (results.get('organic_results') or [])[:3]
+        if 'snippet' in result
+    ]
+    if not cricket_info:
+        return None
+    
+    response_text = f"Here are the cricket results from {yesterday}:\n\n" + "\n\n".join(cricket_info)
+    cricket_cache[yesterday] = response_text
+    if len(cricket_cache) > CRICKET_CACHE_SIZE:
+        # Drop the oldest date
+        del cricket_cache[next(iter(cricket_cache))]
+    return response_text
+
+def parse_sena_services(html: bytes) -> str:
+    """Build the services answer from the sena.services home page HTML."""
+    # Parse the HTML content
+    soup = BeautifulSoup(html, 'lxml')
+
+    # Extract services from the website
+    services = []
+
+    # Look for service sections in common HTML patterns
+    service_sections = soup.select('section[class*="service" i], div[class*="service" i]')
+
+    for section in service_sections:
+        # Look for service items
+        service_items = section.select('h2, h3, li, p')
+        for item in service_items:
+            text = item.get_text(strip=True)
+            if text and len(text) > 10:  # Filter out short texts
+                services.append(text)
+
+    # If no services found in structured format, try to extract from main content
+    if not services:
+        main_content = soup.find('main') or soup.find('article') or soup.find('body')
+        if main_content:
+            paragraphs = main_content.find_all('p')
+            for p in paragraphs:
+                text = p.get_text(strip=True)
+                if text and len(text) > 20 and ('service' in text.lower() or 'offer' in text.lower()):
+                    services.append(text)
+
+    if services:
+        # Format the services list
+        services_list = "\n".join([f"- {service}" for service in services])
+        return f"Sena provides the following services:\n{services_list}{SENA_SERVICES_FOOTER}"
+    else:
+        # If still no services found, use the default list
+        return DEFAULT_SERVICES_TEXT
+
+def cached_sena_services() -> Optional[str]:
+    """Return the cached sena.services answer if it is still fresh."""
+    if sena_cache["text"] is not None and sena_cache["expires_at"] > time.monotonic():
+        return sena_cache["text"]
+    return None
+
+async def fetch_sena_services(http: httpx.AsyncClient) -> Optional[str]:
+    """Return the sena.services answer, or None if the site is unreachable.
+
+    The parsed answer is cached for SENA_CACHE_TTL_SECONDS; once it expires the
+    page is revalidated with its ETag so an unchanged page is not parsed again.
+    """
+    cached_text = cached_sena_services()
+    if cached_text is not None:
+        return cached_text
+    
+    now = time.monotonic()
+    headers = {}
+    if sena_cache["text"] is not None and sena_cache["etag"]:
+        headers["If-None-Match"] = sena_cache["etag"]
+    try:
+        response = await asyncio.wait_for(
+            http.get('https://sena.services', headers=headers),
+            timeout=EXTERNAL_CALL_TIMEOUT
+        )
+    except Exception:
+        sena_cache["last_failed"] = True
+        raise
+    
+    if response.status_code == 304:
+        sena_cache.update(expires_at=now + SENA_CACHE_TTL_SECONDS, last_failed=False)
+        return sena_cache["text"]
+    if response.status_code != 200:
+        log.warning("Failed to fetch sena.services. Status code: %d", response.status_code)
+        sena_cache["last_failed"] = True
+        return None
+    
+    response_text = parse_sena_services(response.content)
+    sena_cache.update(
+        text=response_text,
+        etag=response.headers.get("etag"),
+        expires_at=now + SENA_CACHE_TTL_SECONDS,
+        last_failed=False
+    )
+    return response_text
+
 @app.post("/api/search")
-async def search(request: SearchRequest):
+async def search(search_request: SearchRequest, request: Request):
     try:
-        query = request.query.lower()  # Convert query to lowercase for easier matching
-        print(f"Received query: {query}")
+        http = request.app.state.http
+        query = search_request.query
+        log.info("Received query: %s", query)
         
         # Check if the query is about cricket
-        cricket_keywords = ['cricket', 'sports', 'match', 'game', 'wicket', 'yesterday']
-        is_cricket_query = any(keyword in query for keyword in cricket_keywords)
+        is_cricket_query = bool(CRICKET_RE.search(query))
         
         if is_cricket_query:
-            print("Detected cricket-related query")
+            log.debug("Detected cricket-related query")
             # Get actual yesterday's date
             yesterday = (datetime.now() - timedelta(days=1)).strftime('%B %d, %Y')
-            search_query = f"cricket match results {yesterday} scorecard highlights"
-            
-            print(f"Searching for cricket results for {yesterday}...")
-            # Use SerpAPI to search for cricket results
-            params = {
-                'api_key': SERPAPI_KEY,
-                'q': search_query,
-                'engine': 'google',
-                'num': 5  # Get more results for better accuracy
-            }
             
+            log.debug("Searching for cricket results for %s...", yesterday)
             try:
-                response = requests.get('https://serpapi.com/search', params=params)
-                results = response.json()
-                
-                if 'organic_results' in results and results['organic_results']:
-                    # Combine information from multiple results for better coverage
-                    cricket_info = []
-                    for result in results['organic_results'][:3]:  # Get top 3 results
-                        if 'snippet' in result:
-                            cricket_info.append(result['snippet'])
-                    
-                    if cricket_info:
-                        response_text = f"Here are the cricket results from {yesterday}:\n\n" + "\n\n".join(cricket_info)
-                    else:
-                        response_text = f"No detailed cricket results found for {yesterday}. Please try searching for a different date."
-                else:
+                response_text = await fetch_cricket_results(http, yesterday)
+                if response_text is None:
                     response_text = f"No cricket results found for {yesterday}. Please try searching for a different date."
             except Exception as serp_error:
-                print(f"Error with SerpAPI: {str(serp_error)}")
+                log.error("Error with SerpAPI: %s", serp_error)
                 response_text = "Unable to fetch cricket results. Please try again later."
         else:
             # Try to search sena.services for non-cricket queries
-            print("Attempting to fetch from sena.services...")
+            log.debug("Attempting to fetch from sena.services...")
+            yesterday = (datetime.now() - timedelta(days=1)).strftime('%B %d, %Y')
+            cricket_task = None
+            if (sena_cache["last_failed"] and cached_sena_services() is None
+                    and yesterday not in cricket_cache):
+                # sena.services failed last time, so start the cricket fallback alongside
+                # the fetch rather than adding the SerpAPI round trip after it. A healthy
+                # site is not speculated on, since every SerpAPI query is billed.
+                cricket_task = asyncio.create_task(fetch_cricket_results(http, yesterday))
+                # Consume the result if it ends up unused, to avoid "exception never retrieved"
+                cricket_task.add_done_callback(lambda task: task.cancelled() or task.exception())
             try:
-                response = requests.get('https://sena.services')
-                if response.status_code == 200:
-                    # Parse the HTML content
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Extract services from the website
-                    services = []
-                    
-                    # Look for service sections in common HTML patterns
-                    service_sections = soup.find_all(['section', 'div'], class_=lambda x: x and ('service' in x.lower() or 'services' in x.lower()))
-                    
-                    for section in service_sections:
-                        # Look for service items
-                        service_items = section.find_all(['h2', 'h3', 'li', 'p'])
-                        for item in service_items:
-                            text = item.get_text(strip=True)
-                            if text and len(text) > 10:  # Filter out short texts
-                                services.append(text)
-                    
-                    # If no services found in structured format, try to extract from main content
-                    if not services:
-                        main_content = soup.find('main') or soup.find('article') or soup.find('body')
-                        if main_content:
-                            paragraphs = main_content.find_all('p')
-                            for p in paragraphs:
-                                text = p.get_text(strip=True)
-                                if text and len(text) > 20 and ('service' in text.lower() or 'offer' in text.lower()):
-                                    services.append(text)
-                    
-                    # If still no services found, use default list
-                    if not services:
-                        services = [
-                            "Web Development",
-                            "Mobile App Development",
-                            "Cloud Services",
-                            "AI and Machine Learning",
-                            "Digital Marketing",
-                            "IT Consulting"
-                        ]
-                    
-                    # Format the services list
-                    services_list = "\n".join([f"- {service}" for service in services])
-                    response_text = f"Sena provides the following services:\n{services_list}\n\nFor more detailed information, please visit https://sena.services directly."
-                else:
-                    print(f"Failed to fetch sena.services. Status code: {response.status_code}")
+                try:
+                    response_text = await fetch_sena_services(http)
+                except Exception as e:
+                    log.error("Error accessing sena.services: %s", e)
+                    response_text = None
+                if response_text is None:
                     # If sena.services is not accessible, fall back to cricket results
-                    yesterday = (datetime.now() - timedelta(days=1)).strftime('%B %d, %Y')
-                    search_query = f"cricket match results {yesterday} scorecard highlights"
-                    print(f"Falling back to cricket results for {yesterday}...")
-                    params = {
-                        'api_key': SERPAPI_KEY,
-                        'q': search_query,
-                        'engine': 'google',
-                        'num': 5
-                    }
-                    response = requests.get('https://serpapi.com/search', params=params)
-                    results = response.json()
-                    if 'organic_results' in results and results['organic_results']:
-                        cricket_info = []
-                        for result in results['organic_results'][:3]:
-                            if 'snippet' in result:
-                                cricket_info.append(result['snippet'])
-                        if cricket_info:
-                            response_text = f"Here are the cricket results from {yesterday}:\n\n" + "\n\n".join(cricket_info)
-                        else:
-                            response_text = "Unable to access sena.services at the moment. Please try again later or visit the website directly."
-                    else:
+                    log.info("Falling back to cricket results for %s...", yesterday)
+                    response_text = await (cricket_task or fetch_cricket_results(http, yesterday))
+                    if response_text is None:
                         response_text = "Unable to access sena.services at the moment. Please try again later or visit the website directly."
             except Exception as e:
-                print(f"Error accessing sena.services: {str(e)}")
+                log.error("Error with SerpAPI: %s", e)
                 response_text = "Unable to access sena.services. Please try again later or visit the website directly."
+            finally:
+                if cricket_task is not None:
+                    cricket_task.cancel()
+
+        # Hand out an id the client can use to stream the spoken answer
+        # Entries share one TTL and are kept in insertion order, so expired ones are at the front
+        now = time.monotonic()
+        while pending_speech:
+            oldest_id = next(iter(pending_speech))
+            if pending_speech[oldest_id]["expires_at"] >= now:
+                break
+            del pending_speech[oldest_id]
+        while len(pending_speech) >= SPEECH_CACHE_SIZE:
+            # Drop the oldest answer to keep memory bounded
+            del pending_speech[next(iter(pending_speech))]
+        audio_id = uuid.uuid4().hex
+        pending_speech[audio_id] = {
+            "text": response_text,
+            "expires_at": now + SPEECH_TTL_SECONDS,
+            "audio": None,
+            "ready": None
+        }
+        
+        return ORJSONResponse(content={
+            "text": response_text,
+            "audio_id": audio_id
+        })
+            
+    except Exception as e:
+        log.exception("Unexpected error in search: %s", e)
+        return ORJSONResponse(
+            status_code=500,
+            content={"error": f"Unexpected error: {str(e)}"}
+        )
+
+async def stream_speech(entry: dict, ready: asyncio.Event, speech_stack: AsyncExitStack, speech_response):
+    """Yield MP3 chunks from an open text-to-speech response as they arrive.
+
+    The complete MP3 is kept on the entry so later requests for the same
+    audio_id are served from memory instead of calling TTS again. `ready` is
+    the event this generation was started with; a timed-out waiter may have
+    cleared entry["ready"] or a retry may have replaced it, so only it is touched.
+    """
+    chunks = []
+    try:
+        async for chunk in speech_response.iter_bytes():
+            chunks.append(chunk)
+            yield chunk
+        entry["audio"] = b"".join(chunks)
+    except Exception as e:
+        # Headers are already sent, so the client just sees a truncated stream
+        log.error("Error streaming text to speech: %s", e)
+    finally:
+        await speech_stack.aclose()
+        # Wake any requests waiting on this generation; if it didn't finish
+        # (error or client disconnect), let the next request try again
+        ready.set()
+        if entry["audio"] is None and entry["ready"] is ready:
+            entry["ready"] = None
 
-        # Convert text response to audio using OpenAI's text-to-speech
+@app.get("/api/search/audio/{audio_id}")
+async def search_audio(audio_id: str):
+    entry = pending_speech.get(audio_id)
+    if entry is None or entry["expires_at"] < time.monotonic():
+        pending_speech.pop(audio_id, None)
+        return ORJSONResponse(
+            status_code=404,
+            content={"error": "Audio not found or expired"}
+        )
+    
+    # MP3 is already compressed, so tell GZipMiddleware to pass it through untouched
+    headers = {"Content-Encoding": "identity"}
+    
+    if entry["audio"] is not None:
+        return Response(content=entry["audio"], media_type="audio/mpeg", headers=headers)
+    
+    ready = entry["ready"]
+    if ready is not None:
+        # Generation is already running; reuse its result. The wait is bounded
+        # in case the first request was cancelled before streaming began.
         try:
-            client = openai.OpenAI(api_key=OPENAI_API_KEY)
-            speech_response = client.audio.speech.create(
+            await asyncio.wait_for(ready.wait(), timeout=SPEECH_WAIT_SECONDS)
+        except asyncio.TimeoutError:
+            # Let the next request retry, unless a newer generation has taken over
+            if entry["ready"] is ready:
+                entry["ready"] = None
+            return ORJSONResponse(
+                status_code=504,
+                content={"error": "Timed out waiting for audio response"}
+            )
+        if entry["audio"] is None:
+            return ORJSONResponse(
+                status_code=502,
+                content={"error": "Failed to generate audio response"}
+            )
+        return Response(content=entry["audio"], media_type="audio/mpeg", headers=headers)
+    
+    # Convert text response to audio using OpenAI's text-to-speech. The response
+    # is opened here so a failed request can still be reported as JSON.
+    ready = asyncio.Event()
+    entry["ready"] = ready
+    speech_stack = AsyncExitStack()
+    try:
+        speech_response = await speech_stack.enter_async_context(
+            openai_client.audio.speech.with_streaming_response.create(
                 model="tts-1",
                 voice="alloy",
-                input=response_text
+                input=entry["text"]
             )
-            
-            # Save the audio to a temporary file
-            temp_audio_path = os.path.join(TEMP_DIR, f"response_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3")
-            speech_response.stream_to_file(temp_audio_path)
-            
-            # Read the audio file and convert to base64
-            with open(temp_audio_path, 'rb') as audio_file:
-                audio_data = audio_file.read()
-                audio_base64 = base64.b64encode(audio_data).decode('utf-8')
-            
-            # Clean up the temporary file
-            os.remove(temp_audio_path)
-            
-            return JSONResponse(content={
-                "text": response_text,
-                "audio": audio_base64
-            })
-            
-        except Exception as e:
-            print(f"Error converting text to speech: {str(e)}")
-            return JSONResponse(content={
-                "text": response_text,
-                "error": "Failed to generate audio response"
-            })
-            
+        )
     except Exception as e:
-        print(f"Unexpected error in search: {str(e)}")
-        return JSONResponse(
-            status_code=500,
-            content={"error": f"Unexpected error: {str(e)}"}
+        log.error("Error converting text to speech: %s", e)
+        await speech_stack.aclose()
+        ready.set()
+        if entry["ready"] is ready:
+            entry["ready"] = None
+        return ORJSONResponse(
+            status_code=502,
+            content={"error": "Failed to generate audio response"}
         )
+    
+    return StreamingResponse(
+        stream_speech(entry, ready, speech_stack, speech_response),
+        media_type="audio/mpeg",
+        headers=headers
+    )
+
+# Serve the frontend (index.html at "/"); mounted last so the API routes take priority
+app.mount("/", StaticFiles(directory="static", html=True), name="static")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=5000) 
\ No newline at end of file
+    # uvloop is not available on Windows (see requirements.txt)
+    loop = "asyncio" if sys.platform == "win32" else "uvloop"
+    uvicorn.run(app, host="0.0.0.0", port=5000, loop=loop, http="httptools") 
\ No newline at end of file
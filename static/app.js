@@ -252,12 +252,11 @@ async function handleResponse(response) {
         console.log("Updating status with text response");
         updateStatus(data.text);
         
-        if (data.audio) {
+        if (data.audio_id) {
             console.log("Processing audio response...");
             try {
-                const audioBlob = base64ToBlob(data.audio, 'audio/mp3');
-                const audioUrl = URL.createObjectURL(audioBlob);
-                const audio = new Audio(audioUrl);
+                // The server streams the MP3, so playback can start before it fully arrives
+                const audio = new Audio(`/api/search/audio/${data.audio_id}`);
                 
                 audio.onplay = () => {
                     console.log("Audio started playing");
@@ -267,13 +266,11 @@ async function handleResponse(response) {
                 audio.onended = () => {
                     console.log("Audio finished playing");
                     updateStatus("Audio playback completed");
-                    URL.revokeObjectURL(audioUrl);
                 };
                 
                 audio.onerror = (error) => {
                     console.error("Audio playback error:", error);
                     updateStatus("Error playing audio response");
-                    URL.revokeObjectURL(audioUrl);
                 };
                 
                 console.log("Starting audio playback");
@@ -291,15 +288,6 @@ async function handleResponse(response) {
     }
 }
 
-function base64ToBlob(base64, type) {
-    const binaryString = window.atob(base64);
-    const bytes = new Uint8Array(binaryString.length);
-    for (let i = 0; i < binaryString.length; i++) {
-        bytes[i] = binaryString.charCodeAt(i);
-    }
-    return new Blob([bytes], { type: type });
-}
-
 // Update status display
 function updateStatus(message, className = '') {
     statusDiv.textContent = message;